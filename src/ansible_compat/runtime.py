@@ -18,7 +18,7 @@ import warnings
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, no_type_check
+from typing import TYPE_CHECKING, Any, ClassVar, no_type_check
 
 import subprocess_tee
 from packaging.version import Version
@@ -40,6 +40,7 @@ from ansible_compat.errors import (
     MissingAnsibleError,
 )
 from ansible_compat.loaders import colpath_from_path, yaml_from_file
+from ansible_compat.ports import cache
 from ansible_compat.prerun import get_cache_dir
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -149,6 +150,9 @@ class Runtime:
     """Ansible Runtime manager."""
 
     _version: Version | None = None
+    # Versions already detected, keyed on the path of the ansible executable,
+    # so that new instances do not have to call 'ansible --version' again.
+    _version_cache: ClassVar[dict[str, Version]] = {}
     collections: OrderedDict[str, Collection] = OrderedDict()
     cache_dir: Path
     # Used to track if we have already initialized the Ansible runtime as attempts
@@ -351,17 +355,7 @@ class Runtime:
 
     def _ensure_module_available(self) -> None:
         """Assure that Ansible Python module is installed and matching CLI version."""
-        ansible_release_module = None
-        with contextlib.suppress(ModuleNotFoundError, ImportError):
-            ansible_release_module = importlib.import_module("ansible.release")
-
-        if ansible_release_module is None:
-            msg = "Unable to find Ansible python module."
-            raise RuntimeError(msg)
-
-        ansible_module_version = Version(
-            ansible_release_module.__version__,
-        )
+        ansible_module_version = _probe_ansible_module()
         if ansible_module_version != self.version:
             msg = f"Ansible CLI ({self.version}) and python module ({ansible_module_version}) versions do not match. This indicates a broken execution environment."
             raise RuntimeError(msg)
@@ -386,6 +380,15 @@ class Runtime:
         """Remove content of cache_dir."""
         shutil.rmtree(self.cache_dir, ignore_errors=True)
 
+    @classmethod
+    def clear_version_cache(cls) -> None:
+        """Forget ansible versions detected by previous instances.
+
+        Useful when the ansible executable found in PATH was replaced, as
+        following instances would otherwise keep reporting the old version.
+        """
+        cls._version_cache.clear()
+
     def run(  # ruff: disable=PLR0913
         self,
         args: str | list[str],
@@ -451,9 +454,16 @@ class Runtime:
         if self._version:
             return self._version
 
+        executable = shutil.which("ansible", path=self.environ.get("PATH"))
+        if executable and executable in self._version_cache:
+            self._version = self._version_cache[executable]
+            return self._version
+
         proc = self.run(["ansible", "--version"])
         if proc.returncode == 0:
             self._version = parse_ansible_version(proc.stdout)
+            if executable:
+                self._version_cache[executable] = self._version
             return self._version
 
         msg = "Unable to find a working copy of ansible executable."
@@ -956,6 +966,27 @@ class Runtime:
             _logger.info("Set %s=%s", varname, value_str)
 
 
+@cache
+def _probe_ansible_module() -> Version:
+    """Return the version of the Ansible python module, memoized.
+
+    Returns:
+        Version: Version of the importable ansible-core package.
+
+    Raises:
+        RuntimeError: If the Ansible python module cannot be imported.
+    """
+    ansible_release_module = None
+    with contextlib.suppress(ModuleNotFoundError, ImportError):
+        ansible_release_module = importlib.import_module("ansible.release")
+
+    if ansible_release_module is None:
+        msg = "Unable to find Ansible python module."
+        raise RuntimeError(msg)
+
+    return Version(ansible_release_module.__version__)
+
+
 def _get_role_fqrn(galaxy_infos: dict[str, Any], project_dir: Path) -> str:
     """Compute role fqrn."""
     role_namespace = _get_galaxy_role_ns(galaxy_infos)
@@ -996,6 +1027,24 @@ def _get_galaxy_role_name(galaxy_infos: dict[str, Any]) -> str:
     return result
 
 
+def isolated_collections_path(project_dir: Path) -> Path:
+    """Return the collections path used by an isolated runtime of a project.
+
+    Unlike instantiating :class:`Runtime`, this does not call any Ansible
+    command. As it relies on :func:`get_cache_dir`, it still creates the
+    ``roles`` and ``collections`` directories of the cache and, when the
+    project directory is not writable, falls back to a temporary directory
+    with a warning.
+
+    Args:
+        project_dir: Path to the project directory.
+
+    Returns:
+        Path: Collections directory inside the project cache directory.
+    """
+    return get_cache_dir(project_dir, isolated=True) / "collections"
+
+
 def search_galaxy_paths(search_dir: Path) -> list[Path]:
     """Search for galaxy paths (only one level deep).
 
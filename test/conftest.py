@@ -1,23 +1,53 @@
 """Pytest fixtures."""
 
+import hashlib
 import importlib.metadata
 import json
+import os
 import pathlib
 import subprocess
 import sys
 from collections.abc import Callable, Generator
 from pathlib import Path
+from shutil import copytree, rmtree
 
 import pytest
 
 from ansible_compat.runtime import Runtime
 
+GALAXY_CACHE_KEY = "galaxy-cache"
+COMMUNITY_MOLECULE_TARBALL = (
+    Path(__file__).parent.parent
+    / "examples"
+    / "reqs_v2"
+    / "community-molecule-0.1.0.tar.gz"
+)
 
-@pytest.fixture
-# pylint: disable=unused-argument
-def runtime(scope: str = "session") -> Generator[Runtime, None, None]:  # noqa: ARG001
-    """Isolated runtime fixture."""
-    instance = Runtime(isolated=True)
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add custom command line options.
+
+    Args:
+        parser: Pytest command line parser.
+    """
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        default=False,
+        help="Reuse galaxy content installed by previous runs, kept inside pytest cache.",
+    )
+
+
+@pytest.fixture(scope="session")
+def runtime(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[Runtime, None, None]:
+    """Isolated runtime fixture, shared by the whole test session.
+
+    Each session, including each parallel worker, gets its own project
+    directory, so cleaning the cache of one never affects the others.
+    """
+    instance = Runtime(project_dir=tmp_path_factory.mktemp("runtime"), isolated=True)
     yield instance
     instance.clean()
 
@@ -34,6 +64,81 @@ def runtime_tmp(
     instance.clean()
 
 
+@pytest.fixture(scope="session")
+def community_molecule_template(
+    tmp_path_factory: pytest.TempPathFactory,
+    pytestconfig: pytest.Config,
+) -> Path:
+    """Collections directory with community.molecule installed, built once per session.
+
+    The directory is shared by the whole session and must be treated as
+    read-only. Tests needing the collection as a precondition should copy it
+    into their own location instead of calling ansible-galaxy again, unless
+    they only read from it. When pytest runs with ``--cached``, the installed
+    content is preserved inside pytest cache and reused by the following runs.
+
+    Args:
+        tmp_path_factory: Pytest fixture for temp paths.
+        pytestconfig: Pytest config object.
+
+    Returns:
+        Path: Collections directory containing community.molecule.
+    """
+    template = tmp_path_factory.mktemp("collections-shared")
+    # content depends on both the tarball and the ansible-core installing it
+    fingerprint = hashlib.sha256(
+        COMMUNITY_MOLECULE_TARBALL.read_bytes()
+        + query_pkg_version("ansible-core").encode(),
+    ).hexdigest()[:16]
+    cache_name = f"community-molecule-{fingerprint}"
+    cache_key = f"{GALAXY_CACHE_KEY}/{cache_name}"
+    cache = pytestconfig.cache
+    if cache is not None and not pytestconfig.getoption("cached"):
+        # forget content kept by previous runs, including other fingerprints
+        cache.set(cache_key, None)
+        rmtree(cache.mkdir(GALAXY_CACHE_KEY), ignore_errors=True)
+        cache = None
+    if cache is not None:
+        cached = cache.get(cache_key, None)
+        if cached and Path(cached).is_dir():
+            copytree(cached, template, dirs_exist_ok=True)
+            return template
+
+    try:
+        subprocess.run(
+            [
+                "ansible-galaxy",
+                "collection",
+                "install",
+                "--no-deps",
+                str(COMMUNITY_MOLECULE_TARBALL),
+                "-p",
+                str(template),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        pytest.fail(
+            f"Unable to install community.molecule template:\n{exc.stdout}\n{exc.stderr}",
+        )
+    if cache is not None:
+        cache_dir = cache.mkdir(GALAXY_CACHE_KEY)
+        cached_path = cache_dir / cache_name
+        if not cached_path.exists():
+            # parallel workers may race here, so each one writes to its own
+            # directory and only the first rename wins
+            staging = cache_dir / f".{cache_name}-{os.getpid()}"
+            copytree(template, staging, dirs_exist_ok=True)
+            try:
+                staging.rename(cached_path)
+            except OSError:
+                rmtree(staging, ignore_errors=True)
+        cache.set(cache_key, str(cached_path))
+    return template
+
+
 def query_pkg_version(pkg: str) -> str:
     """Get the version of a current installed package.
 
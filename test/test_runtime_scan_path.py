@@ -20,6 +20,7 @@ V2_COLLECTION_VERSION = "0.1.0"
 V2_COLLECTION_FULL_NAME = f"{V2_COLLECTION_NAMESPACE}.{V2_COLLECTION_NAME}"
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     ("scan", "raises_not_found"),
     (
@@ -97,6 +98,7 @@ def test_scan_sys_path(
     runtime_tmp.clean()
 
 
+@pytest.mark.slow
 def test_ro_venv() -> None:
     """Tests behavior when the virtual environment is read-only.
 